@@ -32,10 +32,11 @@ initial_extensions = (
 
 class PWBot(commands.Bot):
     def __init__(self):
+        # Only the events we use, notably presences and typing are left out
         intents = discord.Intents(guilds=True, messages=True, reactions=True,
                                   bans=True, members=True)
         allowed_mentions = discord.AllowedMentions(everyone=False, users=True, roles=False)
-        super().__init__(command_prefix='?', fetch_offline_members=False,
+        super().__init__(command_prefix='?', chunk_guilds_at_startup=False,
                          help_command=meta.PWBotHelp(command_attrs={
                             'brief': 'Display all commands available',
                             'help': 'Display all commands available,\
@@ -48,6 +49,10 @@ class PWBot(commands.Bot):
         self.settings = utils.Settings()
         self.weather_key = config.weather_key
 
+        # Raw reaction listeners by channel ID, see register_reaction_channel
+        self._reaction_add_routes = {}
+        self._reaction_remove_routes = {}
+
         loop = asyncio.get_event_loop()
         try:
             self.pool = loop.run_until_complete(asyncpg.create_pool(config.postgresql))
@@ -68,6 +73,38 @@ class PWBot(commands.Bot):
 
         print(f'Ready: {self.user} (ID: {self.user.id})')
 
+    def register_reaction_channel(self, channel_id, *, add=None, remove=None):
+        """Route raw reaction events in a channel to the listeners passed.
+
+        This way a cog isn't called for every reaction the bot sees, only
+        the ones in the channel it cares about. Listeners should be
+        unregistered with `unregister_reaction_channel` when the cog unloads.
+        """
+        if add is not None:
+            self._reaction_add_routes.setdefault(channel_id, []).append(add)
+        if remove is not None:
+            self._reaction_remove_routes.setdefault(channel_id, []).append(remove)
+
+    def unregister_reaction_channel(self, channel_id, *, add=None, remove=None):
+        """Remove listeners registered with `register_reaction_channel`."""
+        for routes, listener in ((self._reaction_add_routes, add),
+                                 (self._reaction_remove_routes, remove)):
+            if listener is None or listener not in routes.get(channel_id, ()):
+                continue
+
+            routes[channel_id].remove(listener)
+            if not routes[channel_id]:
+                del routes[channel_id]
+
+    async def on_raw_reaction_add(self, payload):
+        for listener in self._reaction_add_routes.get(payload.channel_id, ()):
+            # Scheduled like any other event, so that errors are handled the same
+            self._schedule_event(listener, 'raw_reaction_add', payload)
+
+    async def on_raw_reaction_remove(self, payload):
+        for listener in self._reaction_remove_routes.get(payload.channel_id, ()):
+            self._schedule_event(listener, 'raw_reaction_remove', payload)
+
     async def on_command_error(self, ctx, error):
         ignored_errors = (
             commands.UserInputError,
@@ -1,3 +1,5 @@
+import datetime
+
 from discord.ext import commands, tasks
 
 
@@ -20,13 +22,27 @@ class LFG(commands.Cog):
         if channel is None:
             return
 
-        await channel.guild.chunk()
-        pins = await channel.pins()
+        pins = {pin.id for pin in await channel.pins()}
+
+        # Messages older than 14 days can't be bulk deleted
+        cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=13, hours=23)
+
+        batch = []
+        async for msg in channel.history(limit=None):
+            if msg.id in pins:
+                continue
+
+            if msg.created_at < cutoff:
+                await msg.delete()
+                continue
 
-        def check(msg):
-            return msg not in pins
+            batch.append(msg)
+            if len(batch) == 100:
+                await channel.delete_messages(batch)
+                batch = []
 
-        await channel.purge(limit=None, check=check)
+        if batch:
+            await channel.delete_messages(batch)
 
 
 def setup(bot):
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 
 import discord
 from discord.ext import commands
@@ -12,6 +13,20 @@ def is_beta_channel():
     return commands.check(predicate)
 
 
+def emoji_only(get_emoji):
+    """Only call the decorated reaction listener for one emoji,
+    `get_emoji` is passed the cog and should return the emoji's ID.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, payload):
+            if payload.emoji.id != get_emoji(self):
+                return
+            return await func(self, payload)
+        return wrapper
+    return decorator
+
+
 class Lobby:
     """Represents a waiting beta lobby."""
 
@@ -30,11 +45,13 @@ class Lobby:
         self.timeout = asyncio.create_task(timeout())
 
     async def start(self):
-        self.manager.lobbies.remove(self)
+        self.timeout.cancel()  # The lobby is done, it shouldn't be disbanded later
+
+        self.manager.remove_lobby(self)
         await self.message.clear_reactions()
         await self.message.channel.send(
             'You have enough players to start a game! ' + ', '.join(
-                '<@{0}>'.format(player) for player in self.players
+                [f'<@{player}>' for player in self.players]
             ),
         )
 
@@ -49,12 +66,10 @@ class Lobby:
         if not timeout:
             self.timeout.cancel()  # Cancel the timeout task
 
-        self.manager.lobbies.remove(self)
+        self.manager.remove_lobby(self)
         await self.message.clear_reactions()
         await self.message.channel.send(
-            '<@{0}> your lobby was disbanded.'.format(
-                self.owner_id
-            )
+            f'<@{self.owner_id}> your lobby was disbanded.'
         )
 
         description = 'This lobby was disbanded.'
@@ -71,27 +86,47 @@ class LobbyManager(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-        self.lobbies = set()
+        # These are looked up on every reaction event, and are never changed at runtime
+        self._beta_channel = bot.settings.beta_channel
+        self._high5 = bot.settings.high5_emoji
+        self._high5_str = f':high5:{self._high5}'
+        self._client_id = bot.client_id
+
+        # Lobbies by both message and owner, for quick lookups on every reaction
+        self._by_message = {}
+        self._by_owner = {}
+
+        bot.register_reaction_channel(
+            self._beta_channel,
+            add=self.on_raw_reaction_add, remove=self.on_raw_reaction_remove
+        )
+
+    def cog_unload(self):
+        self.bot.unregister_reaction_channel(
+            self._beta_channel,
+            add=self.on_raw_reaction_add, remove=self.on_raw_reaction_remove
+        )
+
+    def add_lobby(self, lobby):
+        self._by_message[lobby.message.id] = lobby
+        self._by_owner[lobby.owner_id] = lobby
+
+    def remove_lobby(self, lobby):
+        # The owner may have opened a new lobby since, which we shouldn't remove
+        if self._by_message.get(lobby.message.id) is lobby:
+            del self._by_message[lobby.message.id]
+        if self._by_owner.get(lobby.owner_id) is lobby:
+            del self._by_owner[lobby.owner_id]
 
     def get_lobby_by_owner(self, owner_id):
-        for lobby in self.lobbies:
-            if lobby.owner_id == owner_id:
-                return lobby
+        return self._by_owner.get(owner_id)
 
     def get_lobby_by_message(self, message_id):
-        for lobby in self.lobbies:
-            if lobby.message.id == message_id:
-                return lobby
+        return self._by_message.get(message_id)
 
-    @commands.Cog.listener()
+    @emoji_only(lambda self: self._high5)
     async def on_raw_reaction_add(self, payload):
-        if payload.channel_id != self.bot.settings.beta_channel:
-            return
-
-        if payload.user_id == self.bot.client_id:
-            return
-
-        if payload.emoji.id != self.bot.settings.high5_emoji:
+        if payload.user_id == self._client_id:
             return
 
         lobby = self.get_lobby_by_message(payload.message_id)
@@ -99,32 +134,23 @@ class LobbyManager(commands.Cog):
         if lobby is None:
             return
 
-        if payload.user_id == lobby.owner_id and lobby.owner_id in lobby.players:
-            return await self.bot.http.remove_own_reaction(
-                payload.channel_id, payload.message_id,
-                ':high5:{}'.format(self.bot.settings.high5_emoji),
-            )
-
+        # Only the owner can already be a player without having reacted
+        already_joined = payload.user_id in lobby.players
         lobby.players.add(payload.user_id)
 
-        if len(lobby.players) == 1:
+        # Our reaction is no longer needed once someone else has taken its place
+        if already_joined or len(lobby.players) == 1:
             await self.bot.http.remove_own_reaction(
                 payload.channel_id, payload.message_id,
-                ':high5:{}'.format(self.bot.settings.high5_emoji),
+                self._high5_str,
             )
 
         elif lobby.required_players == len(lobby.players):
             await lobby.start()
 
-    @commands.Cog.listener()
+    @emoji_only(lambda self: self._high5)
     async def on_raw_reaction_remove(self, payload):
-        if payload.channel_id != self.bot.settings.beta_channel:
-            return
-
-        if payload.user_id == self.bot.client_id:
-            return
-
-        if payload.emoji.id != self.bot.settings.high5_emoji:
+        if payload.user_id == self._client_id:
             return
 
         lobby = self.get_lobby_by_message(payload.message_id)
@@ -137,7 +163,7 @@ class LobbyManager(commands.Cog):
         if len(lobby.players) == 0:
             await self.bot.http.add_reaction(
                 payload.channel_id, payload.message_id,
-                ':high5:{}'.format(self.bot.settings.high5_emoji),
+                self._high5_str,
             )
 
     @commands.group(invoke_without_command=True)
@@ -161,9 +187,9 @@ class LobbyManager(commands.Cog):
             colour=Colour.cyan(),
         ), allowed_mentions=discord.AllowedMentions(everyone=True, roles=True))
 
-        self.lobbies.add(Lobby(self, ctx.author.id, message, players))
+        self.add_lobby(Lobby(self, ctx.author.id, message, players))
 
-        await message.add_reaction(':high5:{}'.format(self.bot.settings.high5_emoji))
+        await message.add_reaction(self._high5_str)
 
     @lobby.command(name='start')
     @is_beta_channel()
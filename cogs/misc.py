@@ -112,6 +112,7 @@ class Misc(commands.Cog):
 
         message = await ctx.send(embed=embed)
         self.bot.settings.report_message = message.id
+        await self.bot.settings.save()
 
         await message.add_reaction(':high5:{}'.format(self.bot.settings.high5_emoji))
 
@@ -28,8 +28,8 @@ class AutoMod(commands.Cog):
         if link in self.bot.settings.fake_steam_links:
             return await ctx.send('Link already registered.')
 
-        # This way we hit __setattr__
-        self.bot.settings.fake_steam_links += [link]
+        self.bot.settings.fake_steam_links.append(link)
+        await self.bot.settings.save()
         await ctx.send('Registered link.')
 
     @commands.Cog.listener()
@@ -97,9 +97,7 @@ class ReportManager(commands.Cog):
         overwrites.update(self.category.overwrites)
 
         channel = await self.category.create_text_channel(
-            name='{0}-{1}'.format(
-                report_id, author.display_name
-            ),
+            name=f'{report_id}-{author.display_name}',
             sync_permissions=True, overwrites=overwrites,
             reason='Creating report #{0} ({1}) for {2}'.format(
                 report_id, report_id, author.display_name
@@ -113,7 +111,7 @@ class ReportManager(commands.Cog):
         record = await conn.fetchrow(query, report_id, channel.id, author.id)
 
         await channel.send(
-            'Welcome {0}'.format(author.mention),
+            f'Welcome {author.mention}',
             embed=discord.Embed(
                 description=self.open_message,
                 colour=Colour.light_blue(),
@@ -1,10 +1,25 @@
+import asyncio
 import enum
+import re
 
 import discord
 from discord.ext import commands
 
 from cogs.utils import Colour
 
+# Matches the ID of a custom emoji, for example <:high5:123>
+re_custom_emoji = re.compile(r'<a?:\w+:(\d+)>')
+
+
+def emoji_key(reaction):
+    """Get the key used for a reaction in the role cache.
+
+    Custom emojis are keyed by their ID, so that we can use the ID
+    of the payload's emoji directly, and unicode emojis by themselves.
+    """
+    match = re_custom_emoji.fullmatch(reaction)
+    return int(match.group(1)) if match else reaction
+
 
 class RoleType(enum.Enum):
     ping = 0
@@ -19,23 +34,66 @@ class Roles(commands.Cog):
 
         self._role_channel = None
 
-    @property
-    def messages(self):
-        # Defining it directly means it doesn't get changed
-        # when the setting gets set, this is a work-around
-        return {
+        # Role IDs by emoji key for each role type, lazily loaded
+        self.roles = None
+        # Held while loading the roles and while changing them,
+        # so that a load can't miss a change made at the same time.
+        self._roles_lock = asyncio.Lock()
+
+        self.messages = {}
+        self.update_messages()
+
+        bot.register_reaction_channel(
+            bot.settings.role_channel,
+            add=self.on_raw_reaction_add, remove=self.on_raw_reaction_remove
+        )
+
+    def cog_unload(self):
+        self.bot.unregister_reaction_channel(
+            self.bot.settings.role_channel,
+            add=self.on_raw_reaction_add, remove=self.on_raw_reaction_remove
+        )
+
+    def update_messages(self):
+        """Rebuild the message to role type mapping from the settings.
+
+        This is looked up on every reaction event, so it is cached and
+        must be called again whenever one of the messages gets changed.
+        """
+        self.messages = {
             self.bot.settings.pings_message: RoleType.ping,
             self.bot.settings.language_message: RoleType.language,
             self.bot.settings.platform_message: RoleType.platform,
         }
 
+    async def load_roles(self):
+        async with self._roles_lock:
+            # Another reaction may have loaded them while we waited
+            if self.roles is not None:
+                return
+
+            records = await self.bot.pool.fetch('SELECT reaction, role_id, type FROM roles;')
+
+            roles = {role_type: {} for role_type in RoleType}
+            for record in records:
+                role_type = RoleType(record['type'])
+                roles[role_type][emoji_key(record['reaction'])] = record['role_id']
+
+            self.roles = roles
+
+    async def get_role_id(self, emoji, role_type):
+        if self.roles is None:
+            await self.load_roles()
+
+        # Unicode emojis have no ID, their name is the emoji itself
+        return self.roles[role_type].get(emoji.id or emoji.name)
+
     @property
     def role_channel(self):
         if not self._role_channel:
             self._role_channel = self.bot.get_channel(self.bot.settings.role_channel)
         return self._role_channel
 
-    @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
         role_type = self.messages.get(payload.message_id)
         # The message is not pings_message or language_message
@@ -45,8 +103,7 @@ class Roles(commands.Cog):
         if payload.user_id == self.bot.client_id:
             return
 
-        query = 'SELECT role_id FROM roles WHERE reaction=$1 AND type=$2;'
-        role_id = await self.bot.pool.fetchval(query, str(payload.emoji), role_type.value)
+        role_id = await self.get_role_id(payload.emoji, role_type)
         if not role_id:
             # Someone reacted with an emoji that wasn't set up for *this message*.
             # We remove it as to clarify what emojis actually work.
@@ -57,15 +114,13 @@ class Roles(commands.Cog):
 
         await self.bot.http.add_role(payload.guild_id, payload.user_id, role_id)
 
-    @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
         role_type = self.messages.get(payload.message_id)
         # The message is not pings_message or language_message
         if not role_type:
             return
 
-        query = 'SELECT role_id FROM roles WHERE reaction=$1 AND type=$2;'
-        role_id = await self.bot.pool.fetchval(query, str(payload.emoji), role_type.value)
+        role_id = await self.get_role_id(payload.emoji, role_type)
         if not role_id:
             # At this point it was the bot that removed the reaction ( see above ),
             # so we just ignore because there is no role to remove.
@@ -81,7 +136,11 @@ class Roles(commands.Cog):
                     reaction, name, role_id, type, description
                 ) VALUES ($1, $2, $3, $4, $5) RETURNING *;
         """
-        record = await conn.fetchrow(query, emoji, name, role.id, role_type.value, field)
+        async with self._roles_lock:
+            record = await conn.fetchrow(query, emoji, name, role.id, role_type.value, field)
+
+            if self.roles is not None:
+                self.roles[role_type][emoji_key(record['reaction'])] = record['role_id']
 
         message = await self.role_channel.fetch_message(message_id)
 
@@ -99,7 +158,12 @@ class Roles(commands.Cog):
             conn = self.bot.pool
 
         query = 'DELETE FROM roles WHERE reaction=$1 AND type=$2 RETURNING *;'
-        record = await conn.fetchrow(query, emoji, role_type.value)
+        async with self._roles_lock:
+            record = await conn.fetchrow(query, emoji, role_type.value)
+
+            if self.roles is not None:
+                self.roles[role_type].pop(emoji_key(record['reaction']), None)
+
         message = await self.role_channel.fetch_message(message_id)
 
         index = [em.name for em in message.embeds[0].fields].index(
@@ -177,6 +241,8 @@ class Roles(commands.Cog):
 
         message = await ctx.send(embed=embed)
         self.bot.settings.language_message = message.id
+        await self.bot.settings.save()
+        self.update_messages()
 
         for record in records:
             await message.add_reaction(record['reaction'].strip('<>'))
@@ -245,6 +311,8 @@ class Roles(commands.Cog):
 
         message = await ctx.send(embed=embed)
         self.bot.settings.pings_message = message.id
+        await self.bot.settings.save()
+        self.update_messages()
 
         for record in records:
             await message.add_reaction(record['reaction'].strip('<>'))
@@ -314,6 +382,8 @@ class Roles(commands.Cog):
 
         message = await ctx.send(embed=embed)
         self.bot.settings.platform_message = message.id
+        await self.bot.settings.save()
+        self.update_messages()
 
         for record in records:
             await message.add_reaction(record['reaction'].strip('<>'))
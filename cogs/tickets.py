@@ -2,6 +2,7 @@ import asyncio
 import enum
 import io
 import os
+import time
 import zipfile
 
 import discord
@@ -9,6 +10,29 @@ from discord.ext import commands
 
 from cogs.utils import Colour, is_mod, ignore_report_webhooks
 
+# Used for formatting timestamps in transcripts, which is faster than strftime
+_MONTHS = (
+    'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+    'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec',
+)
+
+
+async def fetch_ticket(ctx):
+    """Fetch the ticket record of the context's channel.
+
+    The record is cached on the context, so that the checks and
+    the command itself can share a single query.
+    """
+    try:
+        return ctx.ticket_record
+    except AttributeError:
+        pass
+
+    # asyncpg prepares and caches this statement per connection by itself
+    query = 'SELECT * FROM tickets WHERE channel_id=$1;'
+    ctx.ticket_record = await ctx.db.fetchrow(query, ctx.channel.id)
+    return ctx.ticket_record
+
 
 def ticket_only():
     """Check for channel being a ticket,
@@ -19,13 +43,7 @@ def ticket_only():
         if ctx.guild is None:
             return False
 
-        query = """SELECT EXISTS (
-                SELECT 1 FROM tickets WHERE channel_id=$1 LIMIT 1
-            );
-        """
-        record = await ctx.db.fetchval(query, ctx.channel.id)
-
-        return bool(record)
+        return await fetch_ticket(ctx) is not None
     return commands.check(predicate)
 
 
@@ -34,10 +52,9 @@ def author_only():
         if ctx.guild is None:
             return False
 
-        query = 'SELECT author_id FROM tickets WHERE channel_id=$1;'
-        author_id = await ctx.db.fetchval(query, ctx.channel.id)
+        record = await fetch_ticket(ctx)
 
-        return author_id == ctx.author.id
+        return record is not None and record['author_id'] == ctx.author.id
     return commands.check(predicate)
 
 
@@ -97,6 +114,7 @@ class TicketManager(commands.Cog):
 
         # If issue is None
         issue = issue.strip('<>') if isinstance(issue, str) else issue
+        short_issue = issue[:90] if issue else None
         ticket_id = await conn.fetchval("SELECT nextval('ticket_id');")
 
         overwrites = {
@@ -107,9 +125,7 @@ class TicketManager(commands.Cog):
         overwrites.update(self.category.overwrites)
 
         channel = await self.category.create_text_channel(
-            name='{0}-{1}-{2}'.format(
-                prefix or '', ticket_id, issue[:90] if issue else author.display_name
-            ),
+            name=f"{prefix or ''}-{ticket_id}-{short_issue or author.display_name}",
             sync_permissions=True, overwrites=overwrites,
             reason='Creating ticket #{0}: {1}'.format(ticket_id, issue)
         )
@@ -118,20 +134,32 @@ class TicketManager(commands.Cog):
                     id, channel_id, author_id, issue
                 ) VALUES ($1, $2, $3, $4) RETURNING *;
         """
-        record = await conn.fetchrow(
-            query, ticket_id, channel.id, author.id,
-            issue[:90] if issue else None
+        welcome = discord.Embed(
+            description=await self.bot.fetch_tag(
+                prefix + '-ticket'
+            ) if prefix else self.open_message,
+            colour=Colour.light_blue(),
         )
 
-        await channel.send(
-            'Welcome {0}'.format(author.mention),
-            embed=discord.Embed(
-                description=await self.bot.fetch_tag(
-                    prefix + '-ticket'
-                ) if prefix else self.open_message,
-                colour=Colour.light_blue(),
-            )
+        # The welcome message doesn't depend on the ticket being inserted,
+        # so we don't need to wait for the database before sending it.
+        welcome_task = asyncio.ensure_future(
+            channel.send(f'Welcome {author.mention}', embed=welcome)
         )
+        try:
+            record = await conn.fetchrow(query, ticket_id, channel.id, author.id, short_issue)
+        except BaseException:
+            # Whatever went wrong, don't leave a channel behind without a ticket
+            welcome_task.cancel()
+            try:
+                await welcome_task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+            await channel.delete(reason='Failed to create ticket #{0}'.format(ticket_id))
+            raise
+
+        await welcome_task
 
         title = '{} #{}{}'.format(
             (prefix[0].upper() + prefix[1:]) if prefix else 'Ticket',
@@ -302,32 +330,60 @@ class TicketManager(commands.Cog):
         )
 
     async def _generate_log(self, channel, record):
-        """Create a log archive with transcript and attachments."""
-        messages = ["""Transcript of ticket {0} "{1}" opened by user {2}:\n""".format(
-            record['id'], record['issue'], record['author_id']
-        )]
+        """Create a log archive with transcript and attachments.
 
-        attachments = []
-        async for message in channel.history(limit=None, oldest_first=True):
-            messages.append(
-                "[{0}] {1.author} ({1.author.id}){2}: {1.content}".format(
-                    message.created_at.strftime('%Y %b %d %H:%M:%S'),
-                    message, ' (attachment)' if message.attachments else '',
-                )
-            )
-            attachments.extend(message.attachments)
+        Attachments are downloaded concurrently, a few at a time.
+        """
+        # Fetching newest first is what Discord is best at, so we
+        # fetch everything that way and reverse the order ourselves.
+        history = [message async for message in channel.history(limit=None)]
+        history.reverse()
 
         memory = io.BytesIO()
-        archive = zipfile.ZipFile(memory, 'a', zipfile.ZIP_DEFLATED, False)
+        # Attachments are mostly images and videos which are already compressed,
+        # so only the transcript is worth spending the time compressing.
+        archive = zipfile.ZipFile(memory, 'a', zipfile.ZIP_STORED, False)
 
-        archive.writestr('transcript.txt', '\n'.join(messages))
+        info = zipfile.ZipInfo('transcript.txt', time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
 
-        for index in range(len(attachments)):
-
-            archive.writestr(
-                'attachment-' + str(index) + os.path.splitext(attachments[index].filename)[1],
-                await attachments[index].read()
-            )
+        attachments = []
+        with archive.open(info, 'w') as transcript:
+            transcript.write("""Transcript of ticket {0} "{1}" opened by user {2}:\n""".format(
+                record['id'], record['issue'], record['author_id']
+            ).encode())
+
+            for message in history:
+                created = message.created_at
+                transcript.write((
+                    f'\n[{created.year} {_MONTHS[created.month - 1]} {created.day:02d} '
+                    f'{created.hour:02d}:{created.minute:02d}:{created.second:02d}] '
+                    f'{message.author} ({message.author.id})'
+                    f"{' (attachment)' if message.attachments else ''}: {message.content}"
+                ).encode())
+                attachments.extend(message.attachments)
+
+        # Bound how many attachments are downloaded at the same time
+        semaphore = asyncio.Semaphore(8)
+
+        async def write_attachment(index, attachment):
+            async with semaphore:
+                data = await attachment.read()
+
+            name = 'attachment-' + str(index) + os.path.splitext(attachment.filename)[1]
+            archive.writestr(name, data)
+
+        tasks = [
+            asyncio.ensure_future(write_attachment(index, attachment))
+            for index, attachment in enumerate(attachments)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the other downloads writing into an archive we give up on
+            for task in tasks:
+                task.cancel()
+            raise
         archive.close()
 
         memory.seek(0)
@@ -339,14 +395,14 @@ class TicketManager(commands.Cog):
     async def ticket_close(self, ctx, *, reason=None):
         """Close the ticket and create an archive. The reason should be a summary."""
 
-        query = 'SELECT * from tickets WHERE channel_id=$1;'
-        record = await ctx.db.fetchrow(query, ctx.channel.id)
+        # Only an open ticket is updated, so that the ticket can't be closed twice
+        query = 'UPDATE tickets SET state=$1 WHERE channel_id=$2 AND state=$3 RETURNING *;'
+        record = await ctx.db.fetchrow(
+            query, TicketState.closed.value, ctx.channel.id, TicketState.open.value
+        )
 
         if not record:
-            return
-
-        query = 'UPDATE tickets SET state=$1 WHERE channel_id=$2'
-        await ctx.db.execute(query, TicketState.closed.value, record['channel_id'])
+            return await ctx.send('This ticket is already closed or being closed.')
 
         await ctx.send('Locked the channel. Creating logs, this may take a while.')
 
@@ -358,38 +414,56 @@ class TicketManager(commands.Cog):
                 read_messages=True
             )
         }
-        await ctx.channel.edit(
-            overwrites=overwrites,
-            reason='Locking ticket while creating logs as to not disrupt.'
-        )
 
-        archive = await self._generate_log(ctx.channel, record)
+        # Kept so that the channel can be unlocked again if closing fails
+        previous_overwrites = ctx.channel.overwrites
+
+        try:
+            await ctx.channel.edit(
+                overwrites=overwrites,
+                reason='Locking ticket while creating logs as to not disrupt.'
+            )
 
-        issue = '-' + record['issue'] if record['issue'] else ''
-        filename = f"log-{record['id']}{issue}.zip"
-        log = discord.File(archive, filename=filename)
+            archive = await self._generate_log(ctx.channel, record)
 
-        # We send the file name so that it's easily searched in discord
-        log_message = await self.log_channel.send(filename, file=log)
+            issue = '-' + record['issue'] if record['issue'] else ''
+            filename = f"log-{record['id']}{issue}.zip"
+            log = discord.File(archive, filename=filename)
 
-        message = await self.status_channel.fetch_message(record['status_message_id'])
-        embed = message.embeds[0]
+            # We send the file name so that it's easily searched in discord
+            log_message = await self.log_channel.send(filename, file=log)
 
-        embed.description = reason
-        embed.colour = Colour.apricot()
+            message = await self.status_channel.fetch_message(record['status_message_id'])
+            embed = message.embeds[0]
 
-        embed.add_field(name='Log', value=f'[Jump!]({log_message.jump_url})')
+            embed.description = reason
+            embed.colour = Colour.apricot()
 
-        embed.set_footer(
-            text=f'{ctx.author} ({ctx.author.id})',
-            icon_url=ctx.author.avatar_url
-        )
+            embed.add_field(name='Log', value=f'[Jump!]({log_message.jump_url})')
 
-        await message.edit(embed=embed)
+            embed.set_footer(
+                text=f'{ctx.author} ({ctx.author.id})',
+                icon_url=ctx.author.avatar_url
+            )
 
-        await ctx.channel.delete(
-            reason='Closing ticket #{0} because: {1}'.format(record['id'], reason)
-        )
+            await message.edit(embed=embed)
+
+            await ctx.channel.delete(
+                reason='Closing ticket #{0} because: {1}'.format(record['id'], reason)
+            )
+        except Exception:
+            # The channel is still around, reopen the ticket so that closing it can be retried
+            try:
+                await ctx.channel.edit(
+                    overwrites=previous_overwrites,
+                    reason='Unlocking ticket after failing to close it.'
+                )
+            except discord.HTTPException:
+                pass
+
+            query = 'UPDATE tickets SET state=$1 WHERE channel_id=$2;'
+            await ctx.db.execute(query, TicketState.open.value, ctx.channel.id)
+            raise
 
 
 def setup(bot):
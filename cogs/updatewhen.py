@@ -27,6 +27,7 @@ class UpdateWhen(commands.Cog):
     @commands.command()
     async def updatewhen(self, ctx, *, message):
         self.bot.settings.update_when_message = message
+        await self.bot.settings.save()
         await ctx.send('Changed update-when message.')
 
 
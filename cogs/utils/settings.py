@@ -1,19 +1,22 @@
-import json
+import asyncio
+import os
+
+import orjson
 
 
 class Settings:
     """Class for managing all settings.
-    Automatically saves to the json when a setting is updated
+    Changes are kept in memory until `save()` is awaited.
 
     If new settings are added they must be added as attributes below,
     otherwise KeyError is raised for having too many keys
     """
     def __init__(self):
-        # If we're just loading the settings inside init
-        self.init = True
+        # Saves write to the same temporary file, so they can't run at the same time
+        self._save_lock = asyncio.Lock()
 
-        with open('settings.json', 'r') as f:
-            settings = json.load(f)
+        with open('settings.json', 'rb') as f:
+            settings = orjson.loads(f.read())
 
         self.ticket_message = settings.pop('ticket_message', 0)
         self.ticket_category = settings.pop('ticket_category')
@@ -59,25 +62,19 @@ class Settings:
         if settings:  # Empty dictionaries evaluate to False
             raise RuntimeError(f'Too many keys in settings.json file: {settings}')
 
-        # Remove it so that it's not saved when changing other attributes
-        del self.init
-
-    def __setattr__(self, name, value):
-        """Called when an attribute is set or overwritten,
-        so we use this to also save the changes to the settings.json
-        """
-        # Also actually update the attribute
-        self.__dict__[name] = value
+    def _flush(self):
+        # Write to a temporary file first, so that the settings
+        # are never left half-written if something goes wrong.
+        with open('settings.json.tmp', 'wb') as f:
+            f.write(orjson.dumps(
+                {key: value for key, value in self.__dict__.items() if not key.startswith('_')}
+            ))
 
-        try:
-            # We don't want to save the settings, as we're currently loading
-            if self.init or name == 'init':
-                return
-        except AttributeError:
-            # self.init is not defined, and was removed.
-            # We just don't want it to propagate.
-            pass
+        os.replace('settings.json.tmp', 'settings.json')
 
-        # Dump all our attributes
-        with open('settings.json', 'w') as f:
-            json.dump(self.__dict__, f)
+    async def save(self):
+        """Save all settings to the settings.json,
+        this should be awaited after a setting is changed.
+        """
+        async with self._save_lock:
+            await asyncio.to_thread(self._flush)